@@ -1,20 +1,90 @@
+import functools
+import hashlib
+import io
+import logging
+import mmap
 import os
-import platform
-import urllib.request
+import re
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
 import zipfile
 import tarfile
 from pathlib import Path
+import urllib3
 from dotenv import load_dotenv
 
+try:
+    import deflate  # Python bindings for libdeflate
+except ImportError:
+    deflate = None
+
+try:
+    import rapidgzip
+except ImportError:
+    rapidgzip = None
+
+_VERSION = "0.31.0"
+_RELEASE_URL = f"https://github.com/mozilla/geckodriver/releases/download/v{_VERSION}/"
+
+_SHA256_RE = re.compile(r'[0-9a-fA-F]{64}')
+
+# sys.platform -> (download URL, name of the binary inside the archive)
+_OS_TABLE = {
+    'win32': (_RELEASE_URL + f"geckodriver-v{_VERSION}-win64.zip", "geckodriver.exe"),
+    'darwin': (_RELEASE_URL + f"geckodriver-v{_VERSION}-macos.tar.gz", "geckodriver"),
+    'linux': (_RELEASE_URL + f"geckodriver-v{_VERSION}-linux64.tar.gz", "geckodriver"),
+}
+
+log = logging.getLogger('geckodriver_installer')
+
+# Shared connection pool so redirects and retries reuse the same TLS session.
+# Transient server errors are retried with exponential backoff, and the timeouts
+# keep a stalled connection from hanging the installation indefinitely.
+_POOL = urllib3.PoolManager(
+    maxsize=4,
+    retries=urllib3.util.Retry(
+        total=3,
+        backoff_factor=0.3,
+        status_forcelist=(500, 502, 503, 504),
+        respect_retry_after_header=True,
+    ),
+    timeout=urllib3.Timeout(connect=5, read=30),
+)
+
+@functools.lru_cache(maxsize=1)
+def _env() -> tuple:
+    """
+    Loads the .env file once per process and returns the GeckoDriver settings.
+    :return: GECKODRIVER_PATH and the optional GECKODRIVER_SHA256 (None if unset).
+    """
+    load_dotenv()
+    return os.environ.get('GECKODRIVER_PATH'), os.environ.get('GECKODRIVER_SHA256')
+
+class _MappedFile:
+    """
+    Read-only file object over an mmap. zipfile needs seekable(), which mmap
+    objects lack; everything else is delegated to the mapping.
+    """
+    def __init__(self, mapping: mmap.mmap):
+        self._mapping = mapping
+
+    def __getattr__(self, name):
+        return getattr(self._mapping, name)
+
+    def seekable(self) -> bool:
+        return True
+
 class GeckoDriverInstaller:
     def __init__(self):
         """
         Initializes the installer with the target directory where GeckoDriver
         will be installed permanently, as defined in the .env file.
         """
-        load_dotenv()
-
-        self.geckodriver_path = os.getenv('GECKODRIVER_PATH')
+        # expected_sha256 is optional: the SHA-256 of the release archive, as a hex string.
+        self.geckodriver_path, self.expected_sha256 = _env()
         if not self.geckodriver_path:
             raise ValueError("GeckoDriver path not set in the .env file.")
 
@@ -26,82 +96,340 @@ class GeckoDriverInstaller:
             raise NotADirectoryError(f"The target path {self.target_dir} is not a directory.")
 
         self.download_url = None
+        self._bin = None
+        self.archive_name = None
+        self.archive = None
         self.download_path = None
+        self._downloader = None
+        self._download_error = None
+        self._sha256 = None
+        self._checksum_fetcher = None
+        self._published_sha256 = None
 
     def get_download_url(self) -> str:
         """
-        Determines the download URL for GeckoDriver based on the operating system.
+        Determines the download URL and binary name for GeckoDriver based on the
+        operating system.
         :return: The URL to download the appropriate GeckoDriver version.
         """
-        system = platform.system().lower()
+        try:
+            self.download_url, self._bin = _OS_TABLE[sys.platform]
+        except KeyError:
+            raise OSError("Unsupported operating system.") from None
 
-        if system == "windows":
-            self.download_url = "https://github.com/mozilla/geckodriver/releases/download/v0.31.0/geckodriver-v0.31.0-win64.zip"
-        elif system == "darwin":
-            self.download_url = "https://github.com/mozilla/geckodriver/releases/download/v0.31.0/geckodriver-v0.31.0-macos.tar.gz"
-        elif system == "linux":
-            self.download_url = "https://github.com/mozilla/geckodriver/releases/download/v0.31.0/geckodriver-v0.31.0-linux64.tar.gz"
-        else:
-            raise OSError("Unsupported operating system.")
-        
         return self.download_url
 
     def download_geckodriver(self) -> None:
         """
-        Downloads the GeckoDriver file directly into the target directory.
+        Starts downloading GeckoDriver. A .tar.gz archive is streamed into a pipe
+        by a background thread so extraction can begin as soon as the first bytes
+        arrive; a .zip archive needs its central directory (stored at the end) and
+        is therefore downloaded to a temporary file in the target directory first.
         """
+        # Start from a clean slate so a failed earlier run on this instance
+        # cannot leak its state into this one.
+        self.archive = None
+        self.download_path = None
+        self._downloader = None
+        self._download_error = None
+        self._published_sha256 = None
+
         self.get_download_url()
-        filename = self.download_url.split("/")[-1]
-        self.download_path = self.target_dir / filename
+        self.archive_name = self.download_url.split("/")[-1]
+
+        log.info("Downloading GeckoDriver from %s...", self.download_url)
+        resp = _POOL.request('GET', self.download_url, preload_content=False)
+        if resp.status != 200:
+            resp.release_conn()
+            raise RuntimeError(f"Download failed with HTTP status {resp.status}.")
+        self._sha256 = hashlib.sha256()
+        if not self.expected_sha256:
+            # Fetch the published checksum alongside the archive body.
+            self._checksum_fetcher = threading.Thread(target=self._fetch_published_sha256, daemon=True)
+            self._checksum_fetcher.start()
+
+        if self.archive_name.endswith(".tar.gz"):
+            read_fd, write_fd = os.pipe()
+            self.archive = open(read_fd, 'rb')
+            self._downloader = threading.Thread(target=self._stream_download, args=(resp, write_fd), daemon=True)
+            self._downloader.start()
+        else:
+            fd, tmp = tempfile.mkstemp(suffix=".zip", dir=self.target_dir)
+            self.download_path = Path(tmp)
+            self.archive = open(fd, 'w+b')
+            try:
+                self._copy_and_hash(resp, self.archive)
+            finally:
+                resp.release_conn()
+            self.archive.seek(0)
+            log.info("Download completed: %s", self.download_path)
+            self._verify_download()
+
+    def _stream_download(self, resp, write_fd: int) -> None:
+        """
+        Copies the response body into the write end of the pipe. Runs on the
+        download thread; any error is kept for the main thread to report.
+        """
+        try:
+            with open(write_fd, 'wb') as pipe:
+                self._copy_and_hash(resp, pipe)
+        except Exception as e:
+            self._download_error = e
+            resp.close()
+        finally:
+            resp.release_conn()
+
+    def _copy_and_hash(self, resp, dst) -> None:
+        """
+        Copies the response body to dst in 1 MiB chunks, feeding each chunk to
+        the SHA-256 of the download as it passes through.
+        """
+        while chunk := resp.read(1 << 20):
+            self._sha256.update(chunk)
+            dst.write(chunk)
+
+    def _fetch_published_sha256(self) -> None:
+        """
+        Fetches the "<archive>.sha256" file published next to the release
+        archive over the shared connection pool. Releases that do not publish
+        one are simply left unverified.
+
+        Both the GNU ("<hex>  <name>") and BSD ("SHA256 (<name>) = <hex>")
+        layouts are understood. A line naming the archive wins; otherwise a
+        file must contain exactly one digest. Anything else, such as an HTML
+        page from a proxy, is treated as no published checksum.
+        """
+        try:
+            resp = _POOL.request('GET', self.download_url + ".sha256")
+        except urllib3.exceptions.HTTPError:
+            return
+        if resp.status != 200:
+            return
+
+        digests = []
+        for line in resp.data.decode('ascii', 'replace').splitlines():
+            line_digests = [token for token in line.split() if _SHA256_RE.fullmatch(token)]
+            if not line_digests:
+                continue
+            if self.archive_name in line:
+                self._published_sha256 = line_digests[0]
+                return
+            digests.append(line_digests[0])
+        if len(digests) == 1:
+            self._published_sha256 = digests[0]
+
+    def _verify_download(self) -> None:
+        """
+        Compares the SHA-256 of the downloaded archive with GECKODRIVER_SHA256
+        from the .env file or, if that is not set, with the checksum published
+        next to the release archive.
+        """
+        if self._checksum_fetcher is not None:
+            self._checksum_fetcher.join()
+            self._checksum_fetcher = None
+        expected = self.expected_sha256 or self._published_sha256
+
+        digest = self._sha256.hexdigest()
+        log.info("SHA-256 of %s: %s", self.archive_name, digest)
+        if expected and digest != expected.strip().lower():
+            raise ValueError(f"Checksum mismatch for {self.archive_name}: expected {expected}, got {digest}.")
+
+    def _wait_for_download(self) -> None:
+        """
+        Waits for the download thread to finish and re-raises its error, if any.
+        """
+        if self._downloader is not None:
+            self._downloader.join()
+            self._downloader = None
+        if self._download_error is not None:
+            raise RuntimeError(f"Download failed: {self._download_error}") from self._download_error
 
-        print(f"Downloading GeckoDriver from {self.download_url}...")
-        urllib.request.urlretrieve(self.download_url, self.download_path)
-        print(f"Download completed: {self.download_path}")
+    def _abort_download(self) -> None:
+        """
+        Stops the download and checksum threads after extraction of a streamed
+        archive has failed. A dropped connection ends the stream early and makes
+        the gzip decoder or tarfile fail as well, so the download error, being
+        the real cause, is raised in preference to the extraction error.
+        """
+        # Closing the read end unblocks a download thread stuck on a full pipe.
+        self.archive.close()
+        self.archive = None
+        if self._downloader is not None:
+            self._downloader.join()
+            self._downloader = None
+        if self._checksum_fetcher is not None:
+            self._checksum_fetcher.join()
+            self._checksum_fetcher = None
+        error = self._download_error
+        # A broken pipe only means the download was cut off by the close above.
+        if error is not None and not isinstance(error, BrokenPipeError):
+            raise RuntimeError(f"Download failed: {error}") from error
 
     def extract_file(self) -> None:
         """
-        Extracts the downloaded file depending on its type (zip or tar.gz)
-        directly into the target directory.
+        Extracts only the GeckoDriver binary from the downloaded archive
+        (zip or tar.gz) into a temporary file in the target directory, and
+        renames it over the installed binary once the download is verified.
         """
-        print(f"Extracting the file {self.download_path}...")
+        log.info("Extracting the file %s...", self.archive_name)
 
-        if not self.download_path.exists():
-            raise FileNotFoundError(f"The downloaded file {self.download_path} does not exist.")
+        if self.archive is None:
+            raise FileNotFoundError(f"The archive {self.archive_name} has not been downloaded.")
 
-        if self.download_path.suffix == ".zip":
-            with zipfile.ZipFile(self.download_path, 'r') as zip_ref:
-                zip_ref.extractall(self.target_dir)
-        elif self.download_path.name.endswith(".tar.gz"):
-            with tarfile.open(self.download_path, 'r:gz') as tar_ref:
-                tar_ref.extractall(self.target_dir)
+        if self.archive_name.endswith(".zip"):
+            staged = self._extract_zip()
+        elif self.archive_name.endswith(".tar.gz"):
+            try:
+                staged = self._extract_tar()
+            except Exception:
+                self._abort_download()
+                raise
         else:
             raise ValueError("Unsupported file format. It must be .zip or .tar.gz.")
 
-        print(f"Extraction completed in: {self.target_dir}")
+        try:
+            if self.archive_name.endswith(".tar.gz"):
+                # Drain the end-of-archive padding so the download thread is not cut off.
+                while self.archive.read(1 << 20):
+                    pass
+                self._wait_for_download()
+                # The archive was extracted while it streamed in, so it can only be
+                # verified now, before the binary replaces the installed one.
+                self._verify_download()
+            # Being on the same filesystem, the rename is atomic and copies no data.
+            os.replace(staged, self.target_dir / self._bin)
+        except Exception:
+            staged.unlink(missing_ok=True)
+            raise
+
+        log.info("Extraction completed in: %s", self.target_dir)
+
+    def _extract_zip(self) -> Path:
+        """
+        Extracts the GeckoDriver binary from the downloaded .zip archive. The
+        archive is memory-mapped, so parsing the central directory and reading
+        the member are served from the page cache without seek/read syscalls.
+        :return: The path of the temporary file holding the binary.
+        """
+        self.archive.flush()
+        with mmap.mmap(self.archive.fileno(), 0, access=mmap.ACCESS_READ) as mapping:
+            with zipfile.ZipFile(_MappedFile(mapping), 'r') as zip_ref:
+                try:
+                    info = zip_ref.getinfo(self._bin)
+                except KeyError:
+                    raise FileNotFoundError(f"{self._bin} was not found in the archive {self.archive_name}.") from None
+                # The upper 16 bits of external_attr hold the Unix mode, if any was recorded.
+                mode = (info.external_attr >> 16) & 0o777
+                with zip_ref.open(info) as src:
+                    return self._write_binary(src, mode)
+
+    def _extract_tar(self) -> Path:
+        """
+        Extracts the GeckoDriver binary from the downloaded .tar.gz archive with
+        the fastest available gzip decoder: rapidgzip inflates on all cores,
+        libdeflate inflates the whole archive in a single call, and otherwise
+        Python's gzip layer inflates it as the bytes arrive.
+        :return: The path of the temporary file holding the binary.
+        """
+        if rapidgzip is not None:
+            # rapidgzip needs a seekable source, so buffer the streamed archive.
+            buffered = io.BytesIO(self.archive.read())
+            with rapidgzip.open(buffered, parallelization=os.cpu_count()) as gz:
+                with tarfile.open(fileobj=gz, mode='r|') as tar_ref:
+                    return self._extract_tar_member(tar_ref)
+        elif deflate is not None:
+            raw = deflate.gzip_decompress(self.archive.read())
+            with tarfile.open(fileobj=io.BytesIO(raw), mode='r:') as tar_ref:
+                return self._extract_tar_member(tar_ref)
+        else:
+            # 'r|gz' reads the archive sequentially, which is what a pipe allows.
+            with tarfile.open(fileobj=self.archive, mode='r|gz') as tar_ref:
+                return self._extract_tar_member(tar_ref)
+
+    def _extract_tar_member(self, tar_ref: tarfile.TarFile) -> Path:
+        """
+        Finds the GeckoDriver binary in an open tar archive and writes it out.
+        :return: The path of the temporary file holding the binary.
+        """
+        for member in tar_ref:
+            if member.isfile() and member.name == self._bin:
+                with tar_ref.extractfile(member) as src:
+                    return self._write_binary(src, member.mode & 0o777)
+        raise FileNotFoundError(f"{self._bin} was not found in the archive {self.archive_name}.")
+
+    def _write_binary(self, src, mode: int) -> Path:
+        """
+        Streams the GeckoDriver binary into a temporary file in the target
+        directory and applies its permissions. The caller renames it over the
+        installed binary once the download has been verified.
+        :param mode: The permission bits recorded in the archive; 0 means 0o755.
+        :return: The path of the temporary file.
+        """
+        fd, tmp = tempfile.mkstemp(prefix=f".{self._bin}-", dir=self.target_dir)
+        try:
+            with open(fd, 'wb') as dst:
+                shutil.copyfileobj(src, dst, length=1 << 20)
+            # Whatever the archive recorded, the driver has to stay executable.
+            os.chmod(tmp, (mode or 0o755) | 0o111)
+        except Exception:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        return Path(tmp)
 
     def clean_up(self) -> None:
         """
-        Cleans up the downloaded archive file after extraction.
+        Releases the downloaded archive, removes its temporary file and waits
+        for the download and checksum threads.
         """
+        if self.archive is not None:
+            # Closing the read end also unblocks a download thread stuck on a full pipe.
+            self.archive.close()
+            self.archive = None
         if self.download_path and self.download_path.exists():
             self.download_path.unlink()
-            print(f"Removed temporary file: {self.download_path}")
+            log.info("Removed temporary file: %s", self.download_path)
+        if self._downloader is not None:
+            self._downloader.join()
+            self._downloader = None
+        if self._checksum_fetcher is not None:
+            self._checksum_fetcher.join()
+            self._checksum_fetcher = None
+
+    def is_installed(self) -> bool:
+        """
+        Checks whether the binary in the target directory is already the
+        GeckoDriver release this installer provides.
+        :return: True if `geckodriver --version` reports the expected version.
+        """
+        try:
+            out = subprocess.check_output([str(self.target_dir / self._bin), '--version'], timeout=2)
+        except (OSError, subprocess.SubprocessError):
+            return False
+        return _VERSION.encode() in out.split()
 
     def install(self) -> None:
         """
         Executes the installation process: download, extraction, and cleanup.
+        Nothing is done if the expected release is already installed; a missing
+        or broken binary is always replaced by a full download. The download
+        and extraction of .tar.gz archives overlap.
         """
         try:
+            self.get_download_url()
+            if self.is_installed():
+                log.info("GeckoDriver %s is already installed.", _VERSION)
+                return
             self.download_geckodriver()
             self.extract_file()
             self.clean_up()
-            print("GeckoDriver installed and configured successfully!")
+            log.info("GeckoDriver installed and configured successfully!")
         except Exception as e:
-            print(f"An error occurred during installation: {e}")
+            log.error("An error occurred during installation: %s", e)
             self.clean_up()
 
 
 # Running the script
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     installer = GeckoDriverInstaller()  
     installer.install()